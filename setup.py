@@ -10,6 +10,7 @@
 
 """
 
+import ast
 import os
 import re
 from setuptools import setup, find_packages
@@ -19,8 +20,12 @@ readme_file = "README.md"
 license_file = "LICENSE"
 requirements_file = "requirements.txt"
 
-with open(readme_file) as f:
-    long_description = f.read()
+# one requirement per line, without surrounding blanks or trailing comments.
+# As in pip, a comment starts a line or follows a blank, so a '#' inside a
+# word (e.g. an url fragment such as #sha256=... or #egg=...) is kept.
+_REQ_RE = re.compile(
+    r"^[ \t]*([^#\s]\S*(?:[ \t]+[^#\s]\S*)*)(?:[ \t]+#.*)?[ \t\r]*$", re.M
+)
 
 
 def get_absolute_path(*args):
@@ -30,26 +35,38 @@ def get_absolute_path(*args):
 
 def get_requirements(*args):
     """ Get requirements requirements.txt """
-    requirements = set()
     with open(get_absolute_path(*args)) as handle:
-        for line in handle:
-            # Strip comments.
-            line = re.sub(r"^#.*|\s#.*", "", line)
-            # Ignore empty lines
-            if line and not line.isspace():
-                requirements.add(re.sub(r"\s+", "", line))
-    return sorted(requirements)
+        data = handle.read()
+    return sorted({m.group(1) for m in _REQ_RE.finditer(data)})
+
+
+def get_long_description(*args):
+    """ Get the long description from the readme file """
+    with open(get_absolute_path(*args)) as handle:
+        return handle.read()
+
+
+def get_about(*args):
+    """ Get the dunder constants of __about__.py without executing it """
+    with open(get_absolute_path(*args)) as handle:
+        tree = ast.parse(handle.read())
+
+    about = dict()
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            name = getattr(node.targets[0], "id", "")
+            if name.startswith("__") and name.endswith("__"):
+                about[name] = ast.literal_eval(node.value)
+    return about
 
 
-about = {}
-with open(get_absolute_path("./wirepas_backend_client/__about__.py")) as f:
-    exec(f.read(), about)
+about = get_about("./wirepas_backend_client/__about__.py")
 
 setup(
     name=about["__pkg_name__"],
     version=about["__version__"],
     description=about["__description__"],
-    long_description=long_description,
+    long_description=get_long_description(readme_file),
     long_description_content_type="text/markdown",
     author=about["__author__"],
     author_email=about["__author_email__"],
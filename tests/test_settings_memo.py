@@ -0,0 +1,36 @@
+from wirepas_backend_client.tools import Settings
+
+
+class MandatorySettings(Settings):
+    """ Settings with a mandatory field """
+
+    _MANDATORY_FIELDS = ["hostname"]
+
+
+def test_setattr_refreshes_sanity_and_str():
+    """ Setting an attribute drops the memoized results """
+    settings = MandatorySettings(dict(hostname=None))
+    assert settings.sanity() is False
+    assert "hostname: None" in str(settings)
+
+    settings.hostname = "host"
+
+    assert settings.sanity() is True
+    assert "hostname: host" in str(settings)
+
+
+def test_writes_through_to_dict_refresh_sanity_and_str():
+    """ Changes made through the dictionary are not hidden by the memo """
+    settings = MandatorySettings(dict(hostname=None))
+    values = settings.to_dict()
+    assert settings.sanity() is False
+    assert "hostname: None" in str(settings)
+
+    values["hostname"] = "host"
+    assert settings.sanity() is True
+    assert "hostname: host" in str(settings)
+
+    settings.hostname = None
+    values["hostname"] = "other"
+    assert settings.sanity() is True
+    assert "hostname: other" in str(settings)
@@ -0,0 +1,101 @@
+import sys
+
+import pytest
+
+from wirepas_backend_client.tools import ParserHelper
+from wirepas_backend_client.tools import arguments
+
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    """ Parses the mqtt arguments from a settings file and the cmd line """
+
+    def parse(file_content, *argv, custom_arguments=()):
+        path = tmp_path / "settings.yml"
+        path.write_text(file_content)
+        monkeypatch.setattr(
+            sys, "argv", ["prog", "--settings", str(path), *argv]
+        )
+
+        parser = ParserHelper()
+        parser.add_file_settings()
+        parser.add_mqtt()
+        for args, kwargs in custom_arguments:
+            parser.custom.add_argument(*args, **kwargs)
+        return parser.settings()
+
+    return parse
+
+
+def test_command_line_overrides_file(settings):
+    """ A value given in the command line wins over the file """
+    result = settings("mqtt_port: 1000\n", "--mqtt_port", "2000")
+
+    assert result.mqtt_port == 2000
+
+
+def test_file_overrides_environment_and_default(settings, monkeypatch):
+    """ A value given in the file wins over the environment and default """
+    monkeypatch.setitem(
+        arguments._ENV_DEFAULTS, "WM_SERVICES_MQTT_HOSTNAME", "env-host"
+    )
+    monkeypatch.setitem(
+        arguments._ENV_DEFAULTS, "WM_SERVICES_MQTT_USERNAME", "env-user"
+    )
+    result = settings("mqtt_hostname: file-host\nmqtt_port: 1000\n")
+
+    assert result.mqtt_hostname == "file-host"
+    assert result.mqtt_port == 1000
+    assert result.mqtt_username == "env-user"
+
+
+def test_store_true_flag_from_file_survives(settings):
+    """ A store_true flag set only in the file is kept as True """
+    result = settings(
+        "mqtt_force_unsecure: true\nmqtt_persist_session: false\n",
+        "--mqtt_port",
+        "2000",
+    )
+
+    assert result.mqtt_force_unsecure is True
+    assert result.mqtt_persist_session is False
+    assert result.mqtt_port == 2000
+
+
+def test_count_and_append_actions_from_command_line(settings):
+    """ Actions that build on the current value work with a file """
+    result = settings(
+        "mqtt_port: 1000\n",
+        "-v",
+        "-v",
+        "--tag",
+        "a",
+        "--tag",
+        "b",
+        custom_arguments=[
+            (("-v",), dict(action="count", dest="verbose")),
+            (("--tag",), dict(action="append")),
+        ],
+    )
+
+    assert result.verbose == 2
+    assert result.tag == ["a", "b"]
+    assert result.mqtt_port == 1000
+
+
+def test_required_and_positional_from_command_line(settings):
+    """ Required options and positionals given in the cmd line are kept """
+    result = settings(
+        "mqtt_port: 1000\n",
+        "--token",
+        "t",
+        "target",
+        custom_arguments=[
+            (("--token",), dict(required=True)),
+            (("name",), dict()),
+        ],
+    )
+
+    assert result.token == "t"
+    assert result.name == "target"
+    assert result.mqtt_port == 1000
@@ -0,0 +1,56 @@
+import pytest
+import yaml
+
+from wirepas_backend_client.tools.arguments import _load_flat_mapping
+
+LOADERS = [yaml.SafeLoader]
+if hasattr(yaml, "CSafeLoader"):
+    LOADERS.append(yaml.CSafeLoader)
+
+FLAT_DOCUMENTS = [
+    b"mqtt_hostname: 127.0.0.1\nmqtt_port: 1883\nmqtt_force_unsecure: True\n",
+    b"a: 0x1F\nb: yes\nc: ~\nd: 017\ne: 1_000\nf: 1.5e3\ng: .inf\nh: off\n",
+    b"a: 2020-01-02\nb: 2001-12-14t21:59:43.10-05:00\n",
+    b"a: '1'\nb: \"2\"\nc: !!str 3\nd: !!int '4'\n",
+    b"a: !!binary aGVsbG8=\n",
+    b"a: |\n  multi\n  line\nb: >\n  folded\n  text\n",
+    b"a: 1\na: 2\n",
+    b"1: 2\nnull: 3\ntrue: x\n? a\n: b\n",
+    b"%YAML 1.1\n---\na: 1\n...\n",
+    b"\xef\xbb\xbfa: 1\n",
+    "a: \u00e9\n".encode("utf-16"),
+]
+
+OTHER_DOCUMENTS = [
+    b"",
+    b"- 1\n- 2\n",
+    b"a: 1\nb: [1, 2]\n",
+    b"a:\n  b: 1\n",
+    b"a: &x 1\nb: *x\n",
+    b"a: 1\n---\nb: 2\n",
+    b"--- !!map\na: 1\n",
+    b"a: !!python/name:os.system\n",
+    b"a: !custom 1\n",
+    b"<<: 1\n",
+    b"a: '\n",
+]
+
+
+@pytest.mark.parametrize("loader", LOADERS)
+@pytest.mark.parametrize("data", FLAT_DOCUMENTS)
+def test_flat_mapping_matches_yaml_load(data, loader):
+    """ Flat mappings are built exactly as yaml.load builds them """
+    content = _load_flat_mapping(data, loader)
+    expected = yaml.load(data, Loader=loader)
+
+    assert content == expected
+    assert list(content) == list(expected)
+    for key, value in expected.items():
+        assert type(content[key]) is type(value)
+
+
+@pytest.mark.parametrize("loader", LOADERS)
+@pytest.mark.parametrize("data", OTHER_DOCUMENTS)
+def test_other_documents_are_left_to_yaml_load(data, loader):
+    """ Anything but a single flat mapping of scalars returns None """
+    assert _load_flat_mapping(data, loader) is None
@@ -0,0 +1,47 @@
+import os
+import runpy
+
+import pytest
+import setuptools
+
+SETUP_PY = os.path.join(os.path.dirname(__file__), "..", "setup.py")
+
+
+@pytest.fixture
+def get_requirements(monkeypatch):
+    """ Loads setup.py without running setup() """
+    monkeypatch.setattr(setuptools, "setup", lambda **kwargs: None)
+    return runpy.run_path(SETUP_PY)["get_requirements"]
+
+
+def test_requirements_comments_and_blanks(get_requirements, tmp_path):
+    """ Comment lines, trailing comments and blank lines are dropped """
+    path = tmp_path / "requirements.txt"
+    path.write_text(
+        "# a comment\n"
+        "\n"
+        "   \n"
+        "PyYAML==5.3  # trailing comment\n"
+        "  cbor2==4.1.2\r\n"
+        "paho-mqtt==1.5.0\t#tab comment\n"
+    )
+
+    assert get_requirements(str(path)) == [
+        "PyYAML==5.3",
+        "cbor2==4.1.2",
+        "paho-mqtt==1.5.0",
+    ]
+
+
+def test_requirements_keep_url_fragments(get_requirements, tmp_path):
+    """ A '#' that is not preceded by a blank does not start a comment """
+    path = tmp_path / "requirements.txt"
+    path.write_text(
+        "foo @ https://x/foo.tar.gz#sha256=abc\n"
+        "git+https://x/y.git#egg=y  # from git\n"
+    )
+
+    assert get_requirements(str(path)) == [
+        "foo @ https://x/foo.tar.gz#sha256=abc",
+        "git+https://x/y.git#egg=y",
+    ]
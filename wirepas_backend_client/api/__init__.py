@@ -3,12 +3,56 @@
         Copyright 2019 Wirepas Ltd under Apache License, Version 2.0.
         See file LICENSE for full license details.
 """
-# flake8: noqa
-
-from .http import *
-from .influx import *
-from .mqtt import *
-from .mysql import *
-from .stream import StreamObserver
-from .wnt import *
-from .wpe import *
+
+import importlib
+
+# the submodules are only imported when one of their names is accessed
+_LAZY = {
+    "SinkAndGatewayStatusObserver": ".http",
+    "HTTPSettings": ".http",
+    "ConnectionServer": ".http",
+    "HTTPObserver": ".http",
+    "wbcHTTPRequestHandler": ".http",
+    "Influx": ".influx",
+    "InfluxSettings": ".influx",
+    "MQTT": ".mqtt",
+    "MQTTObserver": ".mqtt",
+    "MQTTSettings": ".mqtt",
+    "Topics": ".mqtt",
+    "decode_topic_message": ".mqtt",
+    "topic_message": ".mqtt",
+    "MySQL": ".mysql",
+    "MySQLObserver": ".mysql",
+    "MySQLSettings": ".mysql",
+    "StreamObserver": ".stream",
+    "Backend": ".wnt",
+    "WNTSettings": ".wnt",
+    "WNTSocket": ".wnt",
+    "Service": ".wpe",
+    "WPESettings": ".wpe",
+}
+
+_SUBMODULES = ("http", "influx", "mqtt", "mysql", "stream", "wnt", "wpe")
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    """ Imports the submodule providing name on first access """
+    if name in _SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(
+            "module {} has no attribute {}".format(__name__, name)
+        )
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return __all__ + list(_SUBMODULES)
@@ -11,12 +11,16 @@
         See file LICENSE for full license details.
 """
 
+import importlib
 
-from .connectors import MQTT
-from .decorators import decode_topic_message, topic_message
-from .handlers import MQTTObserver
-from .settings import MQTTSettings
-from .topics import Topics
+_LAZY = {
+    "MQTT": ".connectors",
+    "MQTTObserver": ".handlers",
+    "MQTTSettings": ".settings",
+    "Topics": ".topics",
+    "decode_topic_message": ".decorators",
+    "topic_message": ".decorators",
+}
 
 __all__ = [
     "decode_topic_message",
@@ -26,3 +30,21 @@ __all__ = [
     "MQTTSettings",
     "Topics",
 ]
+
+
+def __getattr__(name):
+    """ Imports the submodule providing name on first access """
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(
+            "module {} has no attribute {}".format(__name__, name)
+        )
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return __all__
@@ -46,6 +46,7 @@ class MySQL(object):
         self.port = port
         self.cursor = None
         self.connection_timeout = connection_timeout
+        self._batch = False
 
     def connect(self, table_creation=True) -> None:
         """ Establishes a connection and service loop. """
@@ -85,6 +86,20 @@ class MySQL(object):
         if table_creation:
             self.create_tables()
 
+    def begin_batch(self) -> None:
+        """ Holds back the commits of the put methods until end_batch """
+        self._batch = True
+
+    def end_batch(self) -> None:
+        """ Commits every insert made since begin_batch """
+        self._batch = False
+        self.database.commit()
+
+    def _commit(self) -> None:
+        """ Commits the last insert unless a batch is open """
+        if not self._batch:
+            self.database.commit()
+
     def close(self: "MySQL") -> None:
         """ Handles disconnect from database object """
         self.cursor.close()
@@ -783,7 +798,7 @@ class MySQL(object):
             )
         )
         self.cursor.execute(query)
-        self.database.commit()
+        self._commit()
 
     def put_diagnostics(self, message):
         """ Dumps the diagnostic object into a table """
@@ -794,7 +809,7 @@ class MySQL(object):
         )
         values = json.dumps(message.serialize())
         self.cursor.execute(statement, (values,))
-        self.database.commit()
+        self._commit()
 
     def put_advertiser(self, message):
         """ Dumps the advertiser object into a table """
@@ -803,7 +818,7 @@ class MySQL(object):
         message.full_adv_serialization = True
         values = json.dumps(message.serialize())
         self.cursor.execute(statement, (values,))
-        self.database.commit()
+        self._commit()
 
     def put_traffic_diagnostics(self, message):
         """ Insert traffic diagnostic packets """
@@ -838,7 +853,7 @@ class MySQL(object):
         )
 
         self.cursor.execute(query)
-        self.database.commit()
+        self._commit()
 
     def put_neighbor_diagnostics(self, message):
         """ Insert neighbor diagnostic packets """
@@ -879,7 +894,7 @@ class MySQL(object):
         )
 
         self.cursor.execute(query)
-        self.database.commit()
+        self._commit()
 
     def put_boot_diagnostics(self, message):
         """ Insert boot diagnostic packets """
@@ -908,7 +923,7 @@ class MySQL(object):
             )
         )
         self.cursor.execute(query)
-        self.database.commit()
+        self._commit()
 
     def put_node_diagnostics(self, message):
         """ Insert node diagnostic packets """
@@ -1030,7 +1045,7 @@ class MySQL(object):
         )
 
         self.cursor.execute(query)
-        self.database.commit()
+        self._commit()
 
         # Create events
         events = []
@@ -1048,7 +1063,7 @@ class MySQL(object):
                 "VALUES {};".format(",".join(events))
             )
             self.cursor.execute(query)
-            self.database.commit()
+            self._commit()
 
     def put_testnw_measurements(self, message):
         """ Insert received test network application packets """
@@ -1093,4 +1108,4 @@ class MySQL(object):
             )
 
             self.cursor.execute(query)
-            self.database.commit()
+            self._commit()
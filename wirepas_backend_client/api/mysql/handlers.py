@@ -35,20 +35,49 @@ from .connectors import MySQL
 
 
 class MySQLObserver(StreamObserver):
-    """ MySQLObserver monitors the internal queues and dumps events to the database """
+    """
+    MySQLObserver monitors the internal queues and dumps events to the database
+
+    When no rx_queue is given, a multiprocessing queue is created for the
+    parallel workers, while a single threaded observer uses a
+    queue.SimpleQueue, which skips the pickling of each message. Such an
+    in-process queue can only be fed from within the same process and it
+    always runs single threaded.
+    """
+
+    # MySQL method storing each message type, besides the received packets
+    _handlers = (
+        (DiagnosticsMessage, "put_diagnostics"),
+        (AdvertiserMessage, "put_advertiser"),
+        (TestNWMessage, "put_testnw_measurements"),
+        (BootDiagnosticsMessage, "put_boot_diagnostics"),
+        (NeighborDiagnosticsMessage, "put_neighbor_diagnostics"),
+        (NodeDiagnosticsMessage, "put_node_diagnostics"),
+        (TrafficDiagnosticsMessage, "put_traffic_diagnostics"),
+    )
+    _dispatch = dict(_handlers)
 
     def __init__(
         self,
         mysql_settings: Settings,
         start_signal: multiprocessing.Event,
         exit_signal: multiprocessing.Event,
-        tx_queue: multiprocessing.Queue,
-        rx_queue: multiprocessing.Queue,
+        tx_queue: multiprocessing.Queue = None,
+        rx_queue: multiprocessing.Queue = None,
         parallel: bool = True,
         n_workers: int = 10,
         timeout: int = 10,
+        batch_size: int = 100,
+        batch_flush_interval: float = 1,
+        ping_interval: float = 10,
         logger=None,
     ) -> "MySQLObserver":
+        if rx_queue is None:
+            if parallel:
+                rx_queue = multiprocessing.Queue()
+            else:
+                rx_queue = queue.SimpleQueue()
+
         super(MySQLObserver, self).__init__(
             start_signal=start_signal,
             exit_signal=exit_signal,
@@ -71,43 +100,112 @@ class MySQLObserver(StreamObserver):
         self.timeout = timeout
         self.parallel = parallel
         self.n_workers = n_workers
+        self.batch_size = batch_size
+        self.batch_flush_interval = batch_flush_interval
+        self.ping_interval = ping_interval
 
     def on_data_received(self):
-        """ Monitor inbound queue for messages to be stored in MySQL """
+        """
+        Monitor inbound queue for messages to be stored in MySQL
+
+        Messages are stored in batches, committed once batch_size messages
+        are pending or batch_flush_interval seconds after the first one
+        arrived.
+        """
+
+        batch = list()
+        flush_at = None
 
         while not self.exit_signal.is_set():
 
-            try:
-                message = self.rx_queue.get(timeout=self.timeout, block=True)
-            except queue.Empty:
-                message = None
-                continue
+            if batch:
+                timeout = max(flush_at - time.monotonic(), 0)
+            else:
+                timeout = self.timeout
+
+            messages = self._drain(
+                self.rx_queue, timeout, self.batch_size - len(batch)
+            )
+            if messages:
+                if not batch:
+                    flush_at = time.monotonic() + self.batch_flush_interval
+                batch.extend(messages)
+
+            if batch and (
+                len(batch) >= self.batch_size or time.monotonic() >= flush_at
+            ):
+                self._store_batch(self.mysql, batch)
+                batch = list()
+
+        if batch:
+            self._store_batch(self.mysql, batch)
+
+    @classmethod
+    def _handler_for(cls, message_type):
+        """ Returns the name of the MySQL method that stores message_type """
+        try:
+            return cls._dispatch[message_type]
+        except KeyError:
+            pass
 
-            self._map_message(self.mysql, message)
+        # subclasses and unhandled types are resolved once and remembered
+        handler = None
+        for base, name in cls._handlers:
+            if issubclass(message_type, base):
+                handler = name
+                break
+        cls._dispatch[message_type] = handler
+        return handler
 
     @staticmethod
     def _map_message(mysql, message):
         """ Inserts the message according to its type """
         mysql.put_to_received_packets(message)
-        if isinstance(message, DiagnosticsMessage):
-            mysql.put_diagnostics(message)
-        elif isinstance(message, AdvertiserMessage):
-            mysql.put_advertiser(message)
-        elif isinstance(message, TestNWMessage):
-            mysql.put_testnw_measurements(message)
-        elif isinstance(message, BootDiagnosticsMessage):
-            mysql.put_boot_diagnostics(message)
-        elif isinstance(message, NeighborDiagnosticsMessage):
-            mysql.put_neighbor_diagnostics(message)
-        elif isinstance(message, NodeDiagnosticsMessage):
-            mysql.put_node_diagnostics(message)
-        elif isinstance(message, TrafficDiagnosticsMessage):
-            mysql.put_traffic_diagnostics(message)
+        handler = MySQLObserver._handler_for(type(message))
+        if handler is not None:
+            getattr(mysql, handler)(message)
+
+    @staticmethod
+    def _drain(rx_queue, timeout, limit) -> list:
+        """
+        Waits up to timeout seconds for a message and then takes, without
+        blocking, whatever else is already queued (up to limit messages).
+        """
+        try:
+            messages = [rx_queue.get(timeout=timeout, block=True)]
+        except queue.Empty:
+            return list()
+
+        try:
+            while len(messages) < limit:
+                messages.append(rx_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        return messages
+
+    @staticmethod
+    def _store_batch(mysql, messages):
+        """ Inserts all the messages and commits them at once """
+        mysql.begin_batch()
+        try:
+            for message in messages:
+                MySQLObserver._map_message(mysql, message)
+        finally:
+            mysql.end_batch()
 
     def pool_on_data_received(self, n_workers=10):
         """ Monitor inbound queue for messages to be stored in MySQL """
 
-        def work(storage_q, exit_signal, settings, timeout, logger):
+        def work(
+            storage_q,
+            exit_signal,
+            settings,
+            timeout,
+            batch_size,
+            ping_interval,
+            logger,
+        ):
 
             mysql = MySQL(
                 username=settings.username,
@@ -121,64 +219,119 @@ class MySQLObserver(StreamObserver):
 
             mysql.connect(table_creation=False)
             pid = os.getpid()
+            next_ping = time.monotonic() + ping_interval
+
+            def ensure_connection():
+                """ Pings the server, reconnecting with backoff when gone """
+                try:
+                    mysql.database.ping(True)
+                    return
+                except MySQLdb.OperationalError:
+                    logger.exception("MySQL worker %s: connection lost.", pid)
+
+                try:
+                    mysql.close()
+                except MySQLdb.Error:
+                    pass
+
+                backoff = 0.5
+                while not exit_signal.is_set():
+                    try:
+                        mysql.connect(table_creation=False)
+                        logger.info("MySQL worker %s: reconnected.", pid)
+                        break
+                    except MySQLdb.Error:
+                        logger.warning(
+                            "MySQL worker %s: reconnect failed, "
+                            "retrying in %ss.",
+                            pid,
+                            backoff,
+                        )
+                        time.sleep(backoff)
+                        backoff = min(backoff * 2, 30)
 
             logger.info("starting MySQL worker %s", pid)
 
             while not exit_signal.is_set():
                 try:
-                    message = storage_q.get(block=True, timeout=timeout)
-                except queue.Empty:
-                    continue
+                    messages = MySQLObserver._drain(
+                        storage_q, timeout, batch_size
+                    )
                 except EOFError:
                     break
                 except KeyboardInterrupt:
                     break
 
-                try:
-                    mysql.database.ping(True)
-                except MySQLdb.OperationalError:
-                    logger.exception(
-                        "MySQL worker %s: connection restart failed.", pid
-                    )
-                    mysql.close()
-                    while not exit_signal.is_set():
-                        try:
-                            mysql.connect(table_creation=False)
-                            logger.exception(
-                                "MySQL worker %s: connection restart failed.",
+                if not messages:
+                    continue
+
+                # a connection error rolls back the whole batch, so the
+                # batch is stored again once after reconnecting
+                for attempt in range(2):
+                    if time.monotonic() >= next_ping:
+                        next_ping = time.monotonic() + ping_interval
+                        ensure_connection()
+
+                    mysql.begin_batch()
+                    try:
+                        for message in messages:
+                            if exit_signal.is_set():
+                                break
+                            try:
+                                MySQLObserver._map_message(mysql, message)
+                            except MySQLdb.OperationalError:
+                                raise
+                            except MySQLdb.Error:
+                                logger.exception(
+                                    "MySQL worker %s: insert failed.", pid
+                                )
+                        mysql.end_batch()
+                        break
+                    except MySQLdb.OperationalError as err:
+                        # check the connection before the next attempt
+                        next_ping = 0
+                        if attempt == 0:
+                            logger.warning(
+                                "MySQL worker %s: batch of %s messages "
+                                "failed (%s), retrying.",
                                 pid,
+                                len(messages),
+                                err,
                             )
-                            break
-                        except MySQLdb.Error:
-                            logger.exception(
-                                "MySQL worker %s: connection restart failed.",
+                        else:
+                            logger.error(
+                                "MySQL worker %s: dropping batch of %s "
+                                "messages (%s).",
                                 pid,
+                                len(messages),
+                                err,
                             )
-                            time.sleep(5)
-
-                if not exit_signal.is_set():
-                    try:
-                        MySQLObserver._map_message(mysql, message)
                     except MySQLdb.Error:
                         logger.exception(
-                            "MySQL worker %s: connection restart failed.", pid
+                            "MySQL worker %s: commit failed.", pid
                         )
+                        next_ping = 0
+                        break
 
             logger.warning("exiting MySQL worker %s", pid)
             return pid
 
         workers = dict()
         for pseq in range(1, n_workers):
-            workers[pseq] = multiprocessing.Process(
+            worker = multiprocessing.Process(
                 target=work,
                 args=(
                     self.rx_queue,
                     self.exit_signal,
                     self.settings,
                     self.timeout,
+                    self.batch_size,
+                    self.ping_interval,
                     self.logger,
                 ),
-            ).start()
+            )
+            worker.start()
+            workers[pseq] = worker
 
         self._wait_for_exit(workers=workers)
 
@@ -201,6 +354,15 @@ class MySQLObserver(StreamObserver):
             self.exit_signal.set()
             raise
 
+        if self.parallel and isinstance(
+            self.rx_queue, (queue.SimpleQueue, queue.Queue)
+        ):
+            self.logger.warning(
+                "in-process queues cannot be shared with workers, "
+                "running single threaded"
+            )
+            self.parallel = False
+
         if self.parallel:
             self.logger.info(
                 "Starting // mysql work. " "Number of workers is %s",
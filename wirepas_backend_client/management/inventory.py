@@ -10,12 +10,16 @@
         See file LICENSE for full license details.
 """
 
+import array
 import collections
 import datetime
 import logging
 import math
 import time
 
+# marks a missing otap value in the per node arrays
+_UNSET = -1
+
 
 class Inventory(object):
     """
@@ -26,8 +30,14 @@ class Inventory(object):
 
     Attributes:
         _nodes(set): contains a set of nodes
-        _index(set): dictionary which stores all the node events
-        _target_nodes (set): which nodes to observe (None if not known)
+        _node_row(dict): maps each node address to its row in the arrays
+        _count(array): how many times each node has been seen
+        _last_seen(list): timestamp of each node's last event
+        _otap_min(array): lowest otap sequence in each node's last event
+        _otap_max(array): highest otap sequence in each node's last event
+        _rss(list): rss measurements of each node's last event
+        _target_nodes (frozenset): which nodes to observe (empty if not known)
+        _remaining_targets (int): how many target nodes have not been seen
         _target_otap_sequence (int): scratchpad sequence to observe in all nodes
         _target_frequency (int) : how many times a given node should be seen
         _start_delay (float) : how long to delay the counting
@@ -36,6 +46,9 @@ class Inventory(object):
         _start (datetime): when to start
         _deadline (datetime) : when to end the test
         _finish (datetime) : when the test has finished
+        _start_mono (float) : monotonic clock reading of _start
+        _deadline_mono (float) : monotonic clock reading of _deadline
+        _finish_mono (float) : monotonic clock reading of _finish
         _elapsed (float) : how many seconds it took to execute the inventory
         _otaped_nodes (set): which nodes have received an otap
         _runtime (float): how long the inventory has been running for
@@ -46,6 +59,33 @@ class Inventory(object):
     # pylint: disable=locally-disabled, too-many-public-methods, too-many-instance-attributes, too-many-arguments
     # pylint: disable=locally-disabled, invalid-name
 
+    __slots__ = (
+        "_target_nodes",
+        "_remaining_targets",
+        "_target_otap_sequence",
+        "_target_frequency",
+        "_start_delay",
+        "_maximum_duration",
+        "_nodes",
+        "_node_row",
+        "_count",
+        "_last_seen",
+        "_otap_min",
+        "_otap_max",
+        "_rss",
+        "_sequence",
+        "_start",
+        "_deadline",
+        "_finish",
+        "_start_mono",
+        "_deadline_mono",
+        "_finish_mono",
+        "_elapsed",
+        "_otaped_nodes",
+        "_runtime",
+        "logger",
+    )
+
     def __init__(
         self,
         target_nodes=None,
@@ -57,9 +97,8 @@ class Inventory(object):
     ) -> "Inventory":
         super(Inventory, self).__init__()
 
-        self._target_nodes = target_nodes
-        if self._target_nodes is None:
-            self._target_nodes = set()
+        self._target_nodes = frozenset(target_nodes or ())
+        self._remaining_targets = len(self._target_nodes)
 
         self._target_otap_sequence = target_otap_sequence
 
@@ -71,12 +110,15 @@ class Inventory(object):
         self._maximum_duration = maximum_duration
 
         self._nodes = set()  # unique list of nodes
-        self._index = dict()
+        self._clear_rows()
 
         self._sequence = None
         self._start = None
         self._deadline = None
         self._finish = None
+        self._start_mono = None
+        self._deadline_mono = None
+        self._finish_mono = None
         self._elapsed = None
         self._otaped_nodes = set()
         self._runtime = None
@@ -96,10 +138,10 @@ class Inventory(object):
     @property
     def elapsed(self) -> int:
         """ Returns how much time has elapsed since the start of the run """
-        runtime = datetime.datetime.utcnow()
-        if self._finish:
-            runtime = self._finish
-        self._runtime = (runtime - self._start).total_seconds()
+        runtime = time.monotonic()
+        if self._finish_mono:
+            runtime = self._finish_mono
+        self._runtime = runtime - self._start_mono
         return self._runtime
 
     @property
@@ -121,16 +163,42 @@ class Inventory(object):
     def finish(self):
         """ Procedure when an inventory has completed """
         self._finish = datetime.datetime.utcnow()
+        self._finish_mono = time.monotonic()
         return self._finish
 
+    def _clear_rows(self):
+        """ Drops all the per node rows """
+        self._node_row = dict()
+        self._count = array.array("Q")
+        self._last_seen = list()
+        self._otap_min = array.array("q")
+        self._otap_max = array.array("q")
+        self._rss = list()
+
+    def _new_row(self, node_address) -> int:
+        """ Appends an empty row for node_address and returns its index """
+        row = len(self._count)
+        self._node_row[node_address] = row
+        self._count.append(0)
+        self._last_seen.append(None)
+        self._otap_min.append(_UNSET)
+        self._otap_max.append(_UNSET)
+        self._rss.append(None)
+        return row
+
     def reset(self):
         """ Clean up the internal variables to start over """
         self._nodes = set()  # unique list of nodes
-        self._index = dict()
+        self._remaining_targets = len(self._target_nodes)
+        self._clear_rows()
+        self._otaped_nodes = set()
 
         self._start = None
         self._deadline = None
         self._finish = None
+        self._start_mono = None
+        self._deadline_mono = None
+        self._finish_mono = None
         self._elapsed = None
 
     def wait(self):
@@ -139,17 +207,21 @@ class Inventory(object):
         self.reset()
 
         now = datetime.datetime.utcnow()
+        now_mono = time.monotonic()
         self._start = now + datetime.timedelta(seconds=self._start_delay)
         self._deadline = self._start + datetime.timedelta(
             seconds=self._maximum_duration
         )
+        self._start_mono = now_mono + self._start_delay
+        self._deadline_mono = self._start_mono + self._maximum_duration
 
         time_to_wait = (self._start - now).total_seconds()
 
-        self.logger.debug(
-            "waiting {} seconds to start".format(time_to_wait),
-            dict(sequence=self.sequence),
-        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "waiting {} seconds to start".format(time_to_wait),
+                dict(sequence=self.sequence),
+            )
         time.sleep(time_to_wait)
 
     def add(
@@ -164,68 +236,70 @@ class Inventory(object):
 
         Arguments:
             rss (list): a list of rss measurements to/from the device
-            otap_sequence (list): a list of otap sequences registered by the device
+            otap_sequence (list): a list of otap sequences registered by the device,
+                as integers that fit in 64 bits
             timestamp (int): a time representation
 
         """
+        rss = rss or ()
+        otap_sequence = otap_sequence or ()
+
+        if (
+            node_address in self._target_nodes
+            and node_address not in self._nodes
+        ):
+            self._remaining_targets -= 1
         self._nodes.add(node_address)
 
-        otap_min = None
-        otap_max = None
-
         if otap_sequence:
             otap_min = min(otap_sequence)
             otap_max = max(otap_sequence)
-
-        # creates an event
-        if otap_min and otap_max and any(rss):
-            event = dict(
-                rss=rss,
-                otap=otap_sequence,
-                otap_max=max(otap_sequence),
-                otap_min=min(otap_sequence),
-            )
-        elif any(rss):
-            event = dict(rss=rss)
-
-        elif any(otap_sequence):
-            event = dict(
-                otap=otap_sequence,
-                otap_max=max(otap_sequence),
-                otap_min=min(otap_sequence),
-            )
         else:
-            event = dict(rss=rss, otap=otap_sequence)
+            otap_min = _UNSET
+            otap_max = _UNSET
 
         # add nodes to index
-        try:
-            self._index[node_address]["count"] += 1
-            self._index[node_address]["last_seen"] = timestamp
-            self._index[node_address]["events"].append(event)
-
-        except KeyError:
-            self._index[node_address] = dict(
-                last_seen=timestamp, events=[event], count=1
-            )
-            self.logger.debug(
-                "adding node: {0} / {1}".format(node_address, event),
-                dict(sequence=self.sequence),
-            )
+        row = self._node_row.get(node_address)
+        if row is None:
+            row = self._new_row(node_address)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "adding node: {0} / rss: {1} otap: {2}".format(
+                        node_address, rss, otap_sequence
+                    ),
+                    dict(sequence=self.sequence),
+                )
+
+        self._count[row] += 1
+        self._last_seen[row] = timestamp
+        self._otap_min[row] = otap_min
+        self._otap_max[row] = otap_max
+        self._rss[row] = rss
+
+        target = self._target_otap_sequence
+        if target is not None and (otap_min == target or otap_max == target):
+            self._otaped_nodes.add(node_address)
+        else:
+            self._otaped_nodes.discard(node_address)
 
     def remove(self, node_address) -> None:
         """ Removes a node from the known inventory """
         self.nodes.remove(node_address)
-        del self._index[node_address]
+        if node_address in self._target_nodes:
+            self._remaining_targets += 1
+        self._otaped_nodes.discard(node_address)
+        # the row is left behind, it is no longer reachable
+        del self._node_row[node_address]
 
     def is_out_of_time(self):
         """ Evaluates if the time has run out for the run """
-        time_left = self.until(self.deadline)
-        self.logger.debug(
-            "time left {}s ...".format(time_left), dict(sequence=self.sequence)
-        )
-        if time_left <= 0:
-            return True
-        return False
+        time_left = self._deadline_mono - time.monotonic()
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "time left {}s ...".format(time_left),
+                dict(sequence=self.sequence),
+            )
+        return time_left <= 0
 
     def is_complete(self) -> bool:
         """
@@ -235,10 +309,7 @@ class Inventory(object):
         if not self._target_nodes or self._target_frequency < math.inf:
             return False
 
-        if self._nodes.issuperset(self._target_nodes):
-            if not self._target_otap_sequence:
-                return True
-        else:
+        if self._remaining_targets:
             self.logger.critical(
                 "elapsed {} - missing {}".format(
                     self.elapsed, self.nodes ^ self._target_nodes
@@ -247,7 +318,7 @@ class Inventory(object):
             )
             return False
 
-        return False
+        return not self._target_otap_sequence
 
     def is_otaped(self) -> bool:
         """
@@ -292,12 +363,6 @@ class Inventory(object):
                 w[k] = d[k]
         return w
 
-    def _account_for_target_nodes(self, d: dict):
-        if self._target_nodes:
-            for node in self._target_nodes:
-                if node not in d:
-                    d[node] = 0
-
     def difference(self):
         """ Returns the difference between seen nodes and target nodes """
         return self.nodes ^ self._target_nodes
@@ -305,7 +370,7 @@ class Inventory(object):
     @property
     def target_nodes(self):
         """ Returns the target nodes to observe in the interface"""
-        return self._target_nodes
+        return set(self._target_nodes)
 
     @property
     def target_otap_sequence(self):
@@ -325,66 +390,55 @@ class Inventory(object):
     @property
     def node(self, node_address):
         """ Retrieves information about a single node"""
-        if node_address in self.nodes:
-            return self._index[node_address]
-        return None
+        if node_address not in self.nodes:
+            return None
+
+        row = self._node_row[node_address]
+        return dict(
+            count=self._count[row],
+            last_seen=self._last_seen[row],
+            rss=self._rss[row],
+            otap_min=self._otap_min[row],
+            otap_max=self._otap_max[row],
+        )
 
     @property
     def otaped_nodes(self):
         """ Provides the set of nodes that have been ottaped to the target """
-        self._otaped_nodes = set()
-        for node_address, details in self._index.items():
-            try:
-                if (
-                    details["events"][-1]["otap_min"]
-                    == self._target_otap_sequence
-                    or details["events"][-1]["otap_max"]
-                    == self._target_otap_sequence
-                ):
-                    self._otaped_nodes.add(node_address)
-            except KeyError:
-                pass
         return self._otaped_nodes
 
+    def _report_values(self):
+        """ Returns the per row values the frequency reports are made of """
+        if self._target_otap_sequence:
+            # nodes whose last event had no otap are reported with 0
+            return [max(value, 0) for value in self._otap_max]
+        return self._count
+
     def frequency(self):
         """ Reports the node frequency"""
-        frequency = dict()
-        nodes = self._index.keys()
-        for node in sorted(nodes):
+        values = self._report_values()
 
-            if self._target_otap_sequence:
-                frequency[node] = self._index[node]["events"][-1]["otap_max"]
-            else:
-                frequency[node] = self._index[node]["count"]
-
-        self._account_for_target_nodes(frequency)
+        # target nodes that have not been seen are reported with 0
+        frequency = dict.fromkeys(self._target_nodes, 0)
+        for node, row in self._node_row.items():
+            frequency[node] = values[row]
 
         return frequency
 
     def frequency_by_value(self):
-        """ Returns an ordered dictionary where frequency is used as a key"""
-        frequency = dict()
-        nodes = self._index.keys()
-        max_value = 0
-        for node in sorted(nodes):
-
-            if self._target_otap_sequence:
-                value = self._index[node]["events"][-1]["otap_max"]
-            else:
-                value = self._index[node]["count"]
-
-            if value > max_value:
-                max_value = value
-
-            if value not in frequency:
-                frequency[value] = set()
-            frequency[value].add(node)
-
-        ofreq = collections.OrderedDict()
-        for key in sorted(frequency.keys()):
-            ofreq["frequency_{0:03}".format(key)] = frequency[key]
-
-        return ofreq
+        """ Returns a dictionary, sorted by frequency, of the node sets """
+        values = self._report_values()
+
+        frequency = collections.defaultdict(set)
+        missing = self._target_nodes - self._nodes
+        if missing:
+            frequency[0] = set(missing)
+        for node, row in self._node_row.items():
+            frequency[values[row]].add(node)
+
+        return {
+            f"frequency_{key:03}": frequency[key] for key in sorted(frequency)
+        }
 
     def __str__(self):
         frequency = self.frequency_by_value()
@@ -10,15 +10,13 @@
 """
 
 import json
-import pkg_resources
+import os
 
 from .generic import GenericMessage
 from ..types import ApplicationTypes
 
-__default_ids = str(
-    pkg_resources.resource_filename(
-        "wirepas_backend_client.messages", "decoders/diagnostics.json"
-    )
+__default_ids = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "diagnostics.json"
 )
 
 
@@ -10,28 +10,744 @@
 """
 
 import argparse
+import concurrent.futures
 import os
-import ssl
+import re
 import sys
-
-import yaml
+import threading
 
 from .utils import JsonSerializer
 from ..__about__ import __version__
 
+# settings whose value is hidden when printed, e.g. mqtt_password or
+# api_key (but not mqtt_keyfile, which is a path)
+_SECRET_RE = re.compile(r"(?:^|_)(?:password|secret|token|key)(?:_|$)", re.I)
+
+# the tag of the scalars that are kept as they are written
+_YAML_STR_TAG = "tag:yaml.org,2002:str"
+
+# parsed settings files, by path, with the mtime and size they were read at
+_YAML_CACHE = dict()
+_YAML_CACHE_LOCK = threading.Lock()
+
+
+def _load_yaml(path: str) -> dict:
+    """ Parses an yaml file, reusing the last result if it is unchanged """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _YAML_CACHE_LOCK:
+        cached = _YAML_CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    # imported here as most invocations never read a settings file
+    import yaml
+
+    # libyaml backed loader when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+    # the raw bytes go straight to the loader, which does the decoding
+    with open(path, "rb") as f:
+        data = f.read()
+
+    content = _load_flat_mapping(data, loader)
+    if content is None:
+        content = yaml.load(data, Loader=loader)
+
+    with _YAML_CACHE_LOCK:
+        _YAML_CACHE[path] = (stamp, content)
+
+    return content
+
+
+def _load_flat_mapping(data: bytes, loader_class):
+    """
+    Builds a document made of a single mapping of scalars straight from
+    the parser events, skipping the node graph that yaml.load composes.
+
+    Returns None for any other document (nested values, anchors, several
+    documents, ...) or when the document is not valid, leaving it to
+    yaml.load to parse it or to report the error.
+    """
+    import yaml
+
+    loader = loader_class(data)
+    get_event = loader.get_event
+    resolve = loader.resolve
+    constructors = loader.yaml_constructors
+
+    def construct(event):
+        if type(event) is not yaml.ScalarEvent or event.anchor:
+            raise LookupError(event)
+        if event.tag in (None, "!"):
+            tag = resolve(yaml.ScalarNode, event.value, event.implicit)
+        else:
+            tag = event.tag
+        if tag == _YAML_STR_TAG:
+            return event.value
+        return constructors[tag](
+            loader, yaml.ScalarNode(tag, event.value, style=event.style)
+        )
+
+    try:
+        get_event()  # stream start
+        get_event()  # document start
+        event = get_event()
+        if (
+            type(event) is not yaml.MappingStartEvent
+            or event.anchor
+            or not event.implicit
+        ):
+            return None
+
+        content = dict()
+        while True:
+            event = get_event()
+            if type(event) is yaml.MappingEndEvent:
+                break
+            content[construct(event)] = construct(get_event())
+
+        # yaml.load expects a single document
+        if type(get_event()) is not yaml.DocumentEndEvent:
+            return None
+        if type(get_event()) is not yaml.StreamEndEvent:
+            return None
+    except (LookupError, yaml.YAMLError):
+        return None
+    finally:
+        loader.dispose()
+
+    return content
+
+
+def _load_settings(paths: list) -> dict:
+    """
+    Parses the settings files, concurrently when there are several, and
+    merges them in order so that later files override earlier ones.
+    Files that do not exist are skipped.
+    """
+
+    def load(path):
+        try:
+            return _load_yaml(path) or dict()
+        except FileNotFoundError:
+            return dict()
+
+    if len(paths) > 1:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(8, len(paths))
+        ) as executor:
+            contents = list(executor.map(load, paths))
+    else:
+        contents = [load(path) for path in paths]
+
+    settings = dict()
+    for content in contents:
+        settings.update(content)
+    return settings
+
+
+def _ssl_constant(name: str):
+    """ Returns a callable that imports ssl and returns the named constant """
+
+    def resolve():
+        import ssl
+
+        return getattr(ssl, name)
+
+    return resolve
+
+
+# Default value of each argument, keyed by the environment variable
+# that overrides it. Callable defaults are only resolved when their
+# argument is registered.
+_DEFAULTS = {
+    "WM_DEBUG_LEVEL": None,
+    "WM_BCLI_HEARTBEAT": 10,
+    "WM_BCLI_FILE_SETTINGS": None,
+    "WM_SERVICES_MQTT_HOSTNAME": None,
+    "WM_SERVICES_MQTT_USERNAME": None,
+    "WM_SERVICES_MQTT_PASSWORD": None,
+    "WM_SERVICES_MQTT_PORT": 8883,
+    "WM_SERVICES_MQTT_CA_CERTS": None,
+    "WM_SERVICES_MQTT_CLIENT_CRT": None,
+    "WM_SERVICES_MQTT_CLIENT_KEY": None,
+    "WM_SERVICES_MQTT_CERT_REQS": _ssl_constant("CERT_REQUIRED"),
+    "WM_SERVICES_MQTT_TLS_VERSION": _ssl_constant("PROTOCOL_TLSv1_2"),
+    "WM_SERVICES_MQTT_CIPHERS": None,
+    "WM_SERVICES_MQTT_PERSIST_SESSION": False,
+    "WM_SERVICES_MQTT_FORCE_UNSECURE": False,
+    "WM_SERVICES_MQTT_ALLOW_UNTRUSTED": False,
+    "WM_SERVICES_MQTT_SUB_TOPIC": "#",
+    "WM_SERVICES_MQTT_SUB_NETWORK_ID": "+",
+    "WM_SERVICES_MQTT_SUB_SINK_ID": "+",
+    "WM_SERVICES_MQTT_SUB_GATEWAY_ID": "+",
+    "WM_SERVICES_MQTT_SUB_SOURCE_ENDPOINT": "+",
+    "WM_SERVICES_MQTT_SUB_DESTINATION_ENDPOINT": "+",
+    "WM_BCLI_TEST_DELAY": None,
+    "WM_BCLI_TEST_DURATION": 10,
+    "WM_BCLI_TEST_NODES": "./nodes.txt",
+    "WM_BCLI_TEST_JITTER_MIN": 0,
+    "WM_BCLI_TEST_JITTER_MAX": 0,
+    "WM_BCLI_TEST_INPUT": None,
+    "WM_BCLI_TEST_OUTPUT": None,
+    "WM_BCLI_TEST_OUTPUT_TIME": False,
+    "WM_BCLI_TEST_TARGET_OTAP": None,
+    "WM_BCLI_TEST_TARGET_FREQUENCY": None,
+    "WM_BCLI_TEST_NUMBER_RUNS": 1,
+    "WM_SERVICES_MYSQL_HOSTNAME": "127.0.0.1",
+    "WM_SERVICES_MYSQL_PORT": 3306,
+    "WM_SERVICES_MYSQL_DATABASE": None,
+    "WM_SERVICES_MYSQL_USERNAME": None,
+    "WM_SERVICES_MYSQL_PASSWORD": None,
+    "WM_SERVICES_MYSQL_CONNECTION_TIMEOUT": 1200,
+    "WM_SERVICES_FLUENTD_HOSTNAME": None,
+    "WM_SERVICES_FLUENTD_PORT": 24224,
+    "WM_SERVICES_FLUENTD_RECORD": "log",
+    "WM_SERVICES_FLUENTD_TAG": "python",
+    "WM_SERVICES_HTTP_HOSTNAME": "127.0.0.1",
+    "WM_SERVICES_HTTP_PORT": 8000,
+    "WM_SERVICES_WNT_HOSTNAME": None,
+    "WM_SERVICES_WNT_USERNAME": None,
+    "WM_SERVICES_WNT_PASSWORD": None,
+    "WM_SERVICES_WNT_WS_PROTOCOL": 2,
+    "WM_SERVICES_WPE_SERVICE_DEFINITION": "./services.json",
+    "WM_SERVICES_WPE_UNSECURE": False,
+    "WM_SERVICES_WPE_NETWORK": None,
+    "WM_SERVICES_INFLUX_HOSTNAME": None,
+    "WM_SERVICES_INFLUX_PORT": 8886,
+    "WM_SERVICES_INFLUX_USERNAME": None,
+    "WM_SERVICES_INFLUX_PASSWORD": None,
+    "WM_SERVICES_INFLUX_DATABASE": "wirepas",
+    "WM_SERVICES_INFLUX_SKIP_SSL": False,
+    "WM_SERVICES_INFLUX_UNSECURE": False,
+    "WM_SERVICES_INFLUX_QUERY_STATEMENT": None,
+}
+
+# The defaults after applying the environment, resolved once at import
+_ENV_DEFAULTS = {
+    variable: os.environ.get(variable, default)
+    for variable, default in _DEFAULTS.items()
+}
+
+# Arguments registered by each ParserHelper.add_* method, as
+# (option, environment variable, add_argument keywords).
+
+_FRAMEWORK_ARGUMENTS = (
+    (
+        "--debug_level",
+        "WM_DEBUG_LEVEL",
+        dict(action="store", type=str, help="Logger debug level"),
+    ),
+    (
+        "--heartbeat",
+        "WM_BCLI_HEARTBEAT",
+        dict(
+            action="store",
+            type=int,
+            help="Amount of seconds to check if processes are alive",
+        ),
+    ),
+)
+
+_FILE_SETTINGS_ARGUMENTS = (
+    (
+        "--settings",
+        "WM_BCLI_FILE_SETTINGS",
+        dict(
+            type=str,
+            required=False,
+            help=(
+                "settings file. Several files can be given separated by "
+                "'{}', later files override the earlier ones.".format(
+                    os.pathsep
+                )
+            ),
+        ),
+    ),
+)
+
+_MQTT_ARGUMENTS = (
+    (
+        "--mqtt_hostname",
+        "WM_SERVICES_MQTT_HOSTNAME",
+        dict(action="store", type=str, help="MQTT broker hostname "),
+    ),
+    (
+        "--mqtt_username",
+        "WM_SERVICES_MQTT_USERNAME",
+        dict(action="store", type=str, help="MQTT broker username "),
+    ),
+    (
+        "--mqtt_password",
+        "WM_SERVICES_MQTT_PASSWORD",
+        dict(action="store", type=str, help="MQTT broker password"),
+    ),
+    (
+        "--mqtt_port",
+        "WM_SERVICES_MQTT_PORT",
+        dict(action="store", type=int, help="MQTT broker port"),
+    ),
+    (
+        "--mqtt_ca_certs",
+        "WM_SERVICES_MQTT_CA_CERTS",
+        dict(
+            action="store",
+            type=str,
+            help=(
+                "A string path to the Certificate Authority certificate files "
+                "that are to be treated as trusted by this client"
+            ),
+        ),
+    ),
+    (
+        "--mqtt_certfile",
+        "WM_SERVICES_MQTT_CLIENT_CRT",
+        dict(
+            action="store",
+            type=str,
+            help="Strings pointing to the PEM encoded client certificate",
+        ),
+    ),
+    (
+        "--mqtt_keyfile",
+        "WM_SERVICES_MQTT_CLIENT_KEY",
+        dict(
+            action="store",
+            type=str,
+            help=(
+                "Strings pointing to the PEM encoded client private keys "
+                "respectively"
+            ),
+        ),
+    ),
+    (
+        "--mqtt_cert_reqs",
+        "WM_SERVICES_MQTT_CERT_REQS",
+        dict(
+            action="store",
+            type=str,
+            help=(
+                "Defines the certificate requirements that the client imposes "
+                "on the broker"
+            ),
+        ),
+    ),
+    (
+        "--mqtt_tls_version",
+        "WM_SERVICES_MQTT_TLS_VERSION",
+        dict(
+            action="store",
+            type=str,
+            help="Specifies the version of the  SSL / TLS protocol to be used",
+        ),
+    ),
+    (
+        "--mqtt_ciphers",
+        "WM_SERVICES_MQTT_CIPHERS",
+        dict(
+            action="store",
+            type=str,
+            help=(
+                "A string specifying which encryption ciphers are allowable "
+                "for this connection"
+            ),
+        ),
+    ),
+    (
+        "--mqtt_persist_session",
+        "WM_SERVICES_MQTT_PERSIST_SESSION",
+        dict(
+            action="store_true",
+            help=(
+                "When False the broker will buffersession packets between "
+                "reconnection"
+            ),
+        ),
+    ),
+    (
+        "--mqtt_force_unsecure",
+        "WM_SERVICES_MQTT_FORCE_UNSECURE",
+        dict(
+            action="store_true",
+            help="When True the broker will skip the TLS handshake",
+        ),
+    ),
+    (
+        "--mqtt_allow_untrusted",
+        "WM_SERVICES_MQTT_ALLOW_UNTRUSTED",
+        dict(
+            action="store_true",
+            help="When true the client will skip the certificate name check.",
+        ),
+    ),
+    (
+        "--mqtt_topic",
+        "WM_SERVICES_MQTT_SUB_TOPIC",
+        dict(action="store", type=str, help="MQTT topic to subscribe to"),
+    ),
+    (
+        "--mqtt_subscribe_network_id",
+        "WM_SERVICES_MQTT_SUB_NETWORK_ID",
+        dict(
+            action="store",
+            type=str,
+            help=(
+                "Specifies the WM sink id to use in the gateway topic "
+                "subscription"
+            ),
+        ),
+    ),
+    (
+        "--mqtt_subscribe_sink_id",
+        "WM_SERVICES_MQTT_SUB_SINK_ID",
+        dict(
+            action="store",
+            type=str,
+            help=(
+                "Specifies the WM sink id to use in the gateway topic "
+                "subscription"
+            ),
+        ),
+    ),
+    (
+        "--mqtt_subscribe_gateway_id",
+        "WM_SERVICES_MQTT_SUB_GATEWAY_ID",
+        dict(
+            action="store",
+            type=str,
+            help=(
+                "Specifies the WM gateway id to use in the gateway topic "
+                "subscription"
+            ),
+        ),
+    ),
+    (
+        "--mqtt_subscribe_source_endpoint",
+        "WM_SERVICES_MQTT_SUB_SOURCE_ENDPOINT",
+        dict(
+            action="store",
+            type=str,
+            help=(
+                "Specifies the WM source endpoint to use in the gateway topic "
+                "subscription"
+            ),
+        ),
+    ),
+    (
+        "--mqtt_subscribe_destination_endpoint",
+        "WM_SERVICES_MQTT_SUB_DESTINATION_ENDPOINT",
+        dict(
+            action="store",
+            type=str,
+            help=(
+                "Specifies the WM destination endpoint to use in the gateway "
+                "topic subscription"
+            ),
+        ),
+    ),
+)
+
+_TEST_ARGUMENTS = (
+    (
+        "--delay",
+        "WM_BCLI_TEST_DELAY",
+        dict(type=int, help="Initial wait in seconds - set None for random"),
+    ),
+    (
+        "--duration",
+        "WM_BCLI_TEST_DURATION",
+        dict(type=int, help="Time to collect data for"),
+    ),
+    (
+        "--nodes",
+        "WM_BCLI_TEST_NODES",
+        dict(type=str, help="File with list of nodes to observe"),
+    ),
+    (
+        "--jitter_minimum",
+        "WM_BCLI_TEST_JITTER_MIN",
+        dict(type=int, help="Minimum amount of sleep between tasks"),
+    ),
+    (
+        "--jitter_maximum",
+        "WM_BCLI_TEST_JITTER_MAX",
+        dict(type=int, help="Maximum amount of sleep between tasks"),
+    ),
+    (
+        "--input",
+        "WM_BCLI_TEST_INPUT",
+        dict(type=str, help="file where to read from"),
+    ),
+    (
+        "--output",
+        "WM_BCLI_TEST_OUTPUT",
+        dict(type=str, help="file where to ouput the report"),
+    ),
+    (
+        "--output_time",
+        "WM_BCLI_TEST_OUTPUT_TIME",
+        dict(
+            action="store_true",
+            help="appends datetime information to the output filename",
+        ),
+    ),
+    (
+        "--target_otap",
+        "WM_BCLI_TEST_TARGET_OTAP",
+        dict(type=int, help="target_otap"),
+    ),
+    (
+        "--target_frequency",
+        "WM_BCLI_TEST_TARGET_FREQUENCY",
+        dict(
+            type=int,
+            help="Number of messages that should be observed for each node",
+        ),
+    ),
+    (
+        "--number_of_runs",
+        "WM_BCLI_TEST_NUMBER_RUNS",
+        dict(type=int, help="Number of test runs to execute"),
+    ),
+)
+
+_DATABASE_ARGUMENTS = (
+    (
+        "--db_hostname",
+        "WM_SERVICES_MYSQL_HOSTNAME",
+        dict(action="store", type=str, help="Database hostname"),
+    ),
+    (
+        "--db_port",
+        "WM_SERVICES_MYSQL_PORT",
+        dict(action="store", type=int, help="Database port"),
+    ),
+    (
+        "--db_database",
+        "WM_SERVICES_MYSQL_DATABASE",
+        dict(action="store", type=str, help="Database schema to use"),
+    ),
+    (
+        "--db_username",
+        "WM_SERVICES_MYSQL_USERNAME",
+        dict(action="store", type=str, help="Database user"),
+    ),
+    (
+        "--db_password",
+        "WM_SERVICES_MYSQL_PASSWORD",
+        dict(action="store", type=str, help="Database password"),
+    ),
+    (
+        "--db_connection_timeout",
+        "WM_SERVICES_MYSQL_CONNECTION_TIMEOUT",
+        dict(action="store", type=int, help="Database connection timeout"),
+    ),
+)
+
+_FLUENTD_ARGUMENTS = (
+    (
+        "--fluentd_hostname",
+        "WM_SERVICES_FLUENTD_HOSTNAME",
+        dict(action="store", type=str, help="Fluentd hostname"),
+    ),
+    (
+        "--fluentd_port",
+        "WM_SERVICES_FLUENTD_PORT",
+        dict(action="store", type=int, help="Fluentd port"),
+    ),
+    (
+        "--fluentd_record",
+        "WM_SERVICES_FLUENTD_RECORD",
+        dict(
+            action="store", type=str, help="Name of record to use (tag.record)"
+        ),
+    ),
+    (
+        "--fluentd_tag",
+        "WM_SERVICES_FLUENTD_TAG",
+        dict(
+            action="store",
+            type=str,
+            help="How to tag outgoing data to fluentd",
+        ),
+    ),
+)
+
+_HTTP_ARGUMENTS = (
+    (
+        "--http_host",
+        "WM_SERVICES_HTTP_HOSTNAME",
+        dict(
+            action="store",
+            type=str,
+            help="Hostname or ip-address that HTTP server is bind to.",
+        ),
+    ),
+    (
+        "--http_port",
+        "WM_SERVICES_HTTP_PORT",
+        dict(action="store", type=int, help="HTTP server port "),
+    ),
+)
+
+_WNT_ARGUMENTS = (
+    (
+        "--wnt_hostname",
+        "WM_SERVICES_WNT_HOSTNAME",
+        dict(type=str, help="domain where to point requests."),
+    ),
+    (
+        "--wnt_username",
+        "WM_SERVICES_WNT_USERNAME",
+        dict(type=str, required=False, help="username to login with."),
+    ),
+    (
+        "--wnt_password",
+        "WM_SERVICES_WNT_PASSWORD",
+        dict(type=str, help="password for user."),
+    ),
+    (
+        "--wnt_protocol_version",
+        "WM_SERVICES_WNT_WS_PROTOCOL",
+        dict(type=int, help="WS API protocol version."),
+    ),
+)
+
+_WPE_ARGUMENTS = (
+    (
+        "--wpe_service_definition",
+        "WM_SERVICES_WPE_SERVICE_DEFINITION",
+        dict(type=str, required=False, help="service configuration file."),
+    ),
+    (
+        "--wpe_unsecure",
+        "WM_SERVICES_WPE_UNSECURE",
+        dict(
+            required=False,
+            action="store_true",
+            help="forces the creation of insecure channels.",
+        ),
+    ),
+    (
+        "--wpe_network",
+        "WM_SERVICES_WPE_NETWORK",
+        dict(required=False, type=int, help="network id to subscribe to."),
+    ),
+)
+
+_INFLUX_ARGUMENTS = (
+    (
+        "--influx_hostname",
+        "WM_SERVICES_INFLUX_HOSTNAME",
+        dict(type=str, required=False, help="hostname of InfluxDB http API"),
+    ),
+    (
+        "--influx_port",
+        "WM_SERVICES_INFLUX_PORT",
+        dict(type=int, required=False, help="port of InfluxDB http API"),
+    ),
+    (
+        "--influx_username",
+        "WM_SERVICES_INFLUX_USERNAME",
+        dict(type=str, required=False, help="user of InfluxDB http API"),
+    ),
+    (
+        "--influx_password",
+        "WM_SERVICES_INFLUX_PASSWORD",
+        dict(type=str, required=False, help="password of InfluxDB http API"),
+    ),
+    (
+        "--influx_database",
+        "WM_SERVICES_INFLUX_DATABASE",
+        dict(type=str, required=False, help="port of InfluxDB http API"),
+    ),
+    (
+        "--influx_skip_ssl",
+        "WM_SERVICES_INFLUX_SKIP_SSL",
+        dict(
+            action="store_true",
+            required=False,
+            help="When true it will not try to create a TLS handshake",
+        ),
+    ),
+    (
+        "--influx_skip_ssl_check",
+        "WM_SERVICES_INFLUX_UNSECURE",
+        dict(
+            action="store_true",
+            required=False,
+            help=(
+                "when true, allows unknown certificates to be used with the "
+                "TLS connection."
+            ),
+        ),
+    ),
+    (
+        "--query_statement",
+        "WM_SERVICES_INFLUX_QUERY_STATEMENT",
+        dict(
+            action="store",
+            type=str,
+            required=False,
+            help="A generic query to run against InfluxDB",
+        ),
+    ),
+)
+
+# argument specs registered in each of the parser groups
+_ARGUMENTS = dict(
+    framework=_FRAMEWORK_ARGUMENTS,
+    file_settings=_FILE_SETTINGS_ARGUMENTS,
+    mqtt=_MQTT_ARGUMENTS,
+    test=_TEST_ARGUMENTS,
+    database=_DATABASE_ARGUMENTS,
+    fluentd=_FLUENTD_ARGUMENTS,
+    http=_HTTP_ARGUMENTS,
+    wnt=_WNT_ARGUMENTS,
+    wpe=_WPE_ARGUMENTS,
+    influx=_INFLUX_ARGUMENTS,
+)
+
 
 class Settings:
     """Simple class to handle library settings"""
 
+    # the memoized results live in a slot so they stay out of __dict__,
+    # which is what items(), to_dict() and __str__ expose. The slot holds
+    # None (nothing memoized yet), a dict of results or False once
+    # memoizing has been turned off by to_dict.
+    __slots__ = ("__dict__", "__weakref__", "_memo")
+
     _MANDATORY_FIELDS = list()
 
     def __init__(self, settings: dict):
         super(Settings, self).__init__()
 
         self.debug_level = None
-
-        for k, v in settings.items():
-            self.__dict__[k] = v
+        self.__dict__.update(settings.items())
+
+    def __setattr__(self, name, value):
+        super(Settings, self).__setattr__(name, value)
+        # any change invalidates the memoized sanity and str results
+        if getattr(self, "_memo", None) is not False:
+            object.__setattr__(self, "_memo", None)
+
+    def _memoized(self, key, compute):
+        """ Returns the cached result for key, computing it if needed """
+        memo = getattr(self, "_memo", None)
+        if memo is False:
+            return compute()
+        if memo is None:
+            memo = dict()
+            object.__setattr__(self, "_memo", memo)
+        try:
+            return memo[key]
+        except KeyError:
+            value = memo[key] = compute()
+            return value
 
     def items(self):
         """ returns the internal dictionary items """
@@ -45,7 +761,10 @@ class Settings:
 
         By default, it assumes all settings are valid.
         """
+        return self._memoized("sanity", self._sanity)
 
+    def _sanity(self) -> bool:
+        """ Checks that none of the mandatory fields is None """
         is_valid = True
         for field in self._MANDATORY_FIELDS:
             if getattr(self, field) is None:
@@ -54,24 +773,35 @@ class Settings:
         return is_valid
 
     def to_dict(self):
-        """ Returns the objects internal dictionary """
+        """
+        Returns the objects internal dictionary
+
+        The dictionary can then be changed without going through setattr,
+        so sanity and str are no longer memoized for this object.
+        """
+        object.__setattr__(self, "_memo", False)
         return self.__dict__
 
     def _helper_str(self, key_filter=None) -> str:
-        mystr = ""
+        return self._memoized(
+            ("str", key_filter), lambda: self._render(key_filter)
+        )
+
+    def _render(self, key_filter=None) -> str:
+        """ Formats the settings, one key per line """
+        lines = list()
         for key, value in self.__dict__.items():
-            if "password" in "key":
-                if value is not None:
-                    value = "password_is_set"
             if key_filter is not None:
                 if key_filter not in key:
                     continue
+            if value is not None and _SECRET_RE.search(key):
+                value = "***"
             hint = "optional"
             if key in self._MANDATORY_FIELDS:
                 hint = "required"
 
-            mystr += "{}: {} ({})\n".format(key, value, hint)
-        return mystr
+            lines.append(f"{key}: {value} ({hint})\n")
+        return "".join(lines)
 
     def __str__(self) -> str:
         return self._helper_str(key_filter=None)
@@ -84,7 +814,8 @@ class ParserHelper:
     Handles the creation and decoding of arguments
     """
 
-    _short_options = list()
+    # settings file keys that map to single dash options, e.g. "v"
+    _short_options = frozenset()
 
     def __init__(
         self,
@@ -100,6 +831,7 @@ class ParserHelper:
         self._arguments = None
         self._groups = dict()
         self._version = __version__
+        self._env = _ENV_DEFAULTS
 
         self.add_framework_settings()
 
@@ -130,53 +862,49 @@ class ParserHelper:
         return self._unknown_arguments
 
     def settings(self, settings_class=None):
-        """ Reads an yaml settings file and puts it through argparse """
+        """
+        Reads an yaml settings file and puts it through argparse
+
+        Arguments given in the command line override the ones in the file.
+        """
 
         # Parse args from cmd line to see if a custom setting file is specified
-        self._arguments = self.parser.parse_args()
-
-        if self._arguments.settings is not None:
-            try:
-                with open(self._arguments.settings, "r") as f:
-                    settings = yaml.load(f, Loader=yaml.FullLoader)
-                    arglist = list()
-
-                    # Add the file parameters
-                    for key, value in settings.items():
-                        if key in self._short_options:
-                            key = "-{}".format(key)
-                        else:
-                            key = "--{}".format(key)
-
-                        # We assume that booleans are always handled with
-                        # store_true. This logic will fail otherwise.
-                        if value is False:
-                            continue
-
-                        arglist.append(key)
-
-                        # do not append True as the key is enough
-                        if value is True:
-                            continue
-                        arglist.append(str(value))
-
-                    arguments = sys.argv
-                    argument_index = 1  # wm-gw
-                    if "python" in arguments[0]:  # pythonX transport (...)
-                        if "-m" in arguments[1]:  # pythonX -m transport (...)
-                            argument_index += 1
-                        argument_index = +1
-                    # Add the cmd line parameters. They will override
-                    # parameters from file if set in both places.
-                    for arg in arguments[argument_index:]:
-                        arglist.append(arg)
-
-                # Override self._arguments as there are parameters from file
-                self._arguments, self._unknown_arguments = self.parser.parse_known_args(
-                    arglist
-                )
-            except FileNotFoundError:
-                pass
+        arguments = self.parser.parse_args()
+        unknown_arguments = None
+        settings_path = getattr(arguments, "settings", None)
+
+        if settings_path is not None:
+            settings = _load_settings(settings_path.split(os.pathsep))
+            arglist = list()
+
+            # Add the file parameters
+            for key, value in settings.items():
+                if key in self._short_options:
+                    key = "-{}".format(key)
+                else:
+                    key = "--{}".format(key)
+
+                # We assume that booleans are always handled with
+                # store_true. This logic will fail otherwise.
+                if value is False:
+                    continue
+
+                arglist.append(key)
+
+                # do not append True as the key is enough
+                if value is True:
+                    continue
+                arglist.append(str(value))
+
+            # Add the cmd line parameters after the file ones, so that they
+            # override the file parameters if set in both places.
+            arglist.extend(sys.argv[1:])
+            arguments, unknown_arguments = self.parser.parse_known_args(
+                arglist
+            )
+
+        self._arguments = arguments
+        self._unknown_arguments = unknown_arguments
 
         if settings_class is None:
             settings_class = Settings
@@ -186,551 +914,77 @@ class ParserHelper:
         return settings
 
     def __getattr__(self, name):
-        if name not in self._groups:
-            self._groups[name] = self._parser.add_argument_group(name)
-
-        return self._groups[name]
+        # custom groups, e.g. parser.requests, are created on first access
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._group(name)
+
+    def _group(self, name):
+        """ Returns the argument group called name, creating it if needed """
+        try:
+            return self._groups[name]
+        except KeyError:
+            group = self._parser.add_argument_group(name)
+            self._groups[name] = group
+            return group
+
+    def _add_group(self, name):
+        """ Registers a group's argument specs with their env defaults """
+        add_argument = self._group(name).add_argument
+        env = self._env
+        for option, variable, kwargs in _ARGUMENTS[name]:
+            if variable is not None:
+                default = env[variable]
+                if callable(default):
+                    default = default()
+                kwargs = dict(kwargs, default=default)
+            add_argument(option, **kwargs)
 
     def add_framework_settings(self):
         """ Adds arguments regarding the backend client operation """
-        self.framework.add_argument(
+        self._group("framework").add_argument(
             "--version", action="version", version=self._version
         )
-
-        self.framework.add_argument(
-            "--debug_level",
-            action="store",
-            default=os.environ.get("WM_DEBUG_LEVEL", None),
-            type=str,
-            help="Logger debug level",
-        )
-
-        self.framework.add_argument(
-            "--heartbeat",
-            action="store",
-            default=os.environ.get("WM_BCLI_HEARTBEAT", 10),
-            type=int,
-            help="Amount of seconds to check if processes are alive",
-        )
+        self._add_group("framework")
 
     def add_file_settings(self):
         """ For file setting handling"""
-        self.file_settings.add_argument(
-            "--settings",
-            type=str,
-            required=False,
-            default=os.environ.get("WM_BCLI_FILE_SETTINGS", None),
-            help="settings file.",
-        )
+        self._add_group("file_settings")
 
     def add_mqtt(self):
         """ Commonly used MQTT arguments """
-
-        self.mqtt.add_argument(
-            "--mqtt_hostname",
-            default=os.environ.get("WM_SERVICES_MQTT_HOSTNAME", None),
-            action="store",
-            type=str,
-            help="MQTT broker hostname ",
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_username",
-            default=os.environ.get("WM_SERVICES_MQTT_USERNAME", None),
-            action="store",
-            type=str,
-            help="MQTT broker username ",
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_password",
-            default=os.environ.get("WM_SERVICES_MQTT_PASSWORD", None),
-            action="store",
-            type=str,
-            help="MQTT broker password",
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_port",
-            default=os.environ.get("WM_SERVICES_MQTT_PORT", 8883),
-            action="store",
-            type=int,
-            help="MQTT broker port",
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_ca_certs",
-            default=os.environ.get("WM_SERVICES_MQTT_CA_CERTS", None),
-            action="store",
-            type=str,
-            help=(
-                "A string path to the Certificate "
-                "Authority certificate files that "
-                "are to be treated as trusted by "
-                "this client"
-            ),
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_certfile",
-            default=os.environ.get("WM_SERVICES_MQTT_CLIENT_CRT", None),
-            action="store",
-            type=str,
-            help=("Strings pointing to the PEM encoded client certificate"),
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_keyfile",
-            default=os.environ.get("WM_SERVICES_MQTT_CLIENT_KEY", None),
-            action="store",
-            type=str,
-            help=(
-                "Strings pointing to the PEM "
-                "encoded client private keys "
-                "respectively"
-            ),
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_cert_reqs",
-            default=os.environ.get(
-                "WM_SERVICES_MQTT_CERT_REQS", ssl.CERT_REQUIRED
-            ),
-            action="store",
-            type=str,
-            help=(
-                "Defines the certificate "
-                "requirements that the client "
-                "imposes on the broker"
-            ),
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_tls_version",
-            default=os.environ.get(
-                "WM_SERVICES_MQTT_TLS_VERSION", ssl.PROTOCOL_TLSv1_2
-            ),
-            action="store",
-            type=str,
-            help=(
-                "Specifies the version of the  SSL / TLS protocol to be used"
-            ),
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_ciphers",
-            default=os.environ.get("WM_SERVICES_MQTT_CIPHERS", None),
-            action="store",
-            type=str,
-            help=(
-                "A string specifying which "
-                "encryption ciphers are allowable "
-                "for this connection"
-            ),
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_persist_session",
-            default=os.environ.get("WM_SERVICES_MQTT_PERSIST_SESSION", False),
-            action="store_true",
-            help=(
-                "When False the broker will buffer"
-                "session packets between "
-                "reconnection"
-            ),
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_force_unsecure",
-            default=os.environ.get("WM_SERVICES_MQTT_FORCE_UNSECURE", False),
-            action="store_true",
-            help=("When True the broker will skip the TLS handshake"),
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_allow_untrusted",
-            default=os.environ.get("WM_SERVICES_MQTT_ALLOW_UNTRUSTED", False),
-            action="store_true",
-            help=(
-                "When true the client will skip the certificate name check."
-            ),
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_topic",
-            default=os.environ.get("WM_SERVICES_MQTT_SUB_TOPIC", "#"),
-            action="store",
-            type=str,
-            help="MQTT topic to subscribe to",
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_subscribe_network_id",
-            default=os.environ.get("WM_SERVICES_MQTT_SUB_NETWORK_ID", "+"),
-            action="store",
-            type=str,
-            help=(
-                "Specifies the WM sink id to use in the gateway topic subscription"
-            ),
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_subscribe_sink_id",
-            default=os.environ.get("WM_SERVICES_MQTT_SUB_SINK_ID", "+"),
-            action="store",
-            type=str,
-            help=(
-                "Specifies the WM sink id to use in the gateway topic subscription"
-            ),
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_subscribe_gateway_id",
-            default=os.environ.get("WM_SERVICES_MQTT_SUB_GATEWAY_ID", "+"),
-            action="store",
-            type=str,
-            help=(
-                "Specifies the WM gateway id to use in the gateway topic subscription"
-            ),
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_subscribe_source_endpoint",
-            default=os.environ.get(
-                "WM_SERVICES_MQTT_SUB_SOURCE_ENDPOINT", "+"
-            ),
-            action="store",
-            type=str,
-            help=(
-                "Specifies the WM source endpoint to use in the gateway topic subscription"
-            ),
-        )
-
-        self.mqtt.add_argument(
-            "--mqtt_subscribe_destination_endpoint",
-            default=os.environ.get(
-                "WM_SERVICES_MQTT_SUB_DESTINATION_ENDPOINT", "+"
-            ),
-            action="store",
-            type=str,
-            help=(
-                "Specifies the WM destination endpoint to use in the gateway topic subscription"
-            ),
-        )
+        self._add_group("mqtt")
 
     def add_test(self):
         """ Commonly used arguments for test execution """
-        self.test.add_argument(
-            "--delay",
-            default=os.environ.get("WM_BCLI_TEST_DELAY", None),
-            type=int,
-            help="Initial wait in seconds - set None for random",
-        )
-
-        self.test.add_argument(
-            "--duration",
-            default=os.environ.get("WM_BCLI_TEST_DURATION", 10),
-            type=int,
-            help="Time to collect data for",
-        )
-
-        self.test.add_argument(
-            "--nodes",
-            default=os.environ.get("WM_BCLI_TEST_NODES", "./nodes.txt"),
-            type=str,
-            help="File with list of nodes to observe",
-        )
-
-        self.test.add_argument(
-            "--jitter_minimum",
-            default=os.environ.get("WM_BCLI_TEST_JITTER_MIN", 0),
-            type=int,
-            help="Minimum amount of sleep between tasks",
-        )
-
-        self.test.add_argument(
-            "--jitter_maximum",
-            default=os.environ.get("WM_BCLI_TEST_JITTER_MAX", 0),
-            type=int,
-            help="Maximum amount of sleep between tasks",
-        )
-
-        self.test.add_argument(
-            "--input",
-            default=os.environ.get("WM_BCLI_TEST_INPUT", None),
-            type=str,
-            help="file where to read from",
-        )
-
-        self.test.add_argument(
-            "--output",
-            default=os.environ.get("WM_BCLI_TEST_OUTPUT", None),
-            type=str,
-            help="file where to ouput the report",
-        )
-
-        self.test.add_argument(
-            "--output_time",
-            default=os.environ.get("WM_BCLI_TEST_OUTPUT_TIME", False),
-            action="store_true",
-            help=("appends datetime information to the output filename"),
-        )
-
-        self.test.add_argument(
-            "--target_otap",
-            default=os.environ.get("WM_BCLI_TEST_TARGET_OTAP", None),
-            type=int,
-            help="target_otap",
-        )
-
-        self.test.add_argument(
-            "--target_frequency",
-            default=os.environ.get("WM_BCLI_TEST_TARGET_FREQUENCY", None),
-            type=int,
-            help=("Number of messages that should be observed for each node"),
-        )
-
-        self.test.add_argument(
-            "--number_of_runs",
-            default=os.environ.get("WM_BCLI_TEST_NUMBER_RUNS", 1),
-            type=int,
-            help="Number of test runs to execute",
-        )
+        self._add_group("test")
 
     def add_database(self):
         """ Commonly used database arguments """
-        self.database.add_argument(
-            "--db_hostname",
-            default=os.environ.get("WM_SERVICES_MYSQL_HOSTNAME", "127.0.0.1"),
-            action="store",
-            type=str,
-            help="Database hostname",
-        )
-
-        self.database.add_argument(
-            "--db_port",
-            default=os.environ.get("WM_SERVICES_MYSQL_PORT", 3306),
-            action="store",
-            type=int,
-            help="Database port",
-        )
-
-        self.database.add_argument(
-            "--db_database",
-            default=os.environ.get("WM_SERVICES_MYSQL_DATABASE", None),
-            action="store",
-            type=str,
-            help="Database schema to use",
-        )
-
-        self.database.add_argument(
-            "--db_username",
-            default=os.environ.get("WM_SERVICES_MYSQL_USERNAME", None),
-            action="store",
-            type=str,
-            help="Database user",
-        )
-
-        self.database.add_argument(
-            "--db_password",
-            default=os.environ.get("WM_SERVICES_MYSQL_PASSWORD", None),
-            action="store",
-            type=str,
-            help="Database password",
-        )
-
-        self.database.add_argument(
-            "--db_connection_timeout",
-            default=os.environ.get(
-                "WM_SERVICES_MYSQL_CONNECTION_TIMEOUT", 1200
-            ),
-            action="store",
-            type=int,
-            help="Database connection timeout",
-        )
+        self._add_group("database")
 
     def add_fluentd(self):
         """ Commonly used fluentd arguments """
-        self.fluentd.add_argument(
-            "--fluentd_hostname",
-            default=os.environ.get("WM_SERVICES_FLUENTD_HOSTNAME", None),
-            action="store",
-            type=str,
-            help="Fluentd hostname",
-        )
-
-        self.fluentd.add_argument(
-            "--fluentd_port",
-            default=os.environ.get("WM_SERVICES_FLUENTD_PORT", 24224),
-            action="store",
-            type=int,
-            help="Fluentd port",
-        )
-
-        self.fluentd.add_argument(
-            "--fluentd_record",
-            default=os.environ.get("WM_SERVICES_FLUENTD_RECORD", "log"),
-            action="store",
-            type=str,
-            help="Name of record to use (tag.record)",
-        )
-
-        self.fluentd.add_argument(
-            "--fluentd_tag",
-            default=os.environ.get("WM_SERVICES_FLUENTD_TAG", "python"),
-            action="store",
-            type=str,
-            help="How to tag outgoing data to fluentd",
-        )
+        self._add_group("fluentd")
 
     def add_http(self):
         """ Commonly used http server arguments """
-        self.http.add_argument(
-            "--http_host",
-            default=os.environ.get("WM_SERVICES_HTTP_HOSTNAME", "127.0.0.1"),
-            action="store",
-            type=str,
-            help=("Hostname or ip-address that HTTP server is bind to."),
-        )
-
-        self.http.add_argument(
-            "--http_port",
-            default=os.environ.get("WM_SERVICES_HTTP_PORT", 8000),
-            action="store",
-            type=int,
-            help="HTTP server port ",
-        )
+        self._add_group("http")
 
     def add_wnt(self):
         """ WNT related settings """
-
-        self.wnt.add_argument(
-            "--wnt_hostname",
-            default=os.environ.get("WM_SERVICES_WNT_HOSTNAME", None),
-            type=str,
-            help="domain where to point requests.",
-        )
-
-        self.wnt.add_argument(
-            "--wnt_username",
-            type=str,
-            required=False,
-            default=os.environ.get("WM_SERVICES_WNT_USERNAME", None),
-            help="username to login with.",
-        )
-
-        self.wnt.add_argument(
-            "--wnt_password",
-            type=str,
-            default=os.environ.get("WM_SERVICES_WNT_PASSWORD", None),
-            help="password for user.",
-        )
-
-        self.wnt.add_argument(
-            "--wnt_protocol_version",
-            type=int,
-            default=os.environ.get("WM_SERVICES_WNT_WS_PROTOCOL", 2),
-            help="WS API protocol version.",
-        )
+        self._add_group("wnt")
 
     def add_wpe(self):
         """ Commonly used http server arguments """
-        self.wpe.add_argument(
-            "--wpe_service_definition",
-            type=str,
-            required=False,
-            default=os.environ.get(
-                "WM_SERVICES_WPE_SERVICE_DEFINITION", "./services.json"
-            ),
-            help="service configuration file.",
-        )
-
-        self.wpe.add_argument(
-            "--wpe_unsecure",
-            required=False,
-            default=os.environ.get("WM_SERVICES_WPE_UNSECURE", False),
-            action="store_true",
-            help="forces the creation of insecure channels.",
-        )
-
-        self.wpe.add_argument(
-            "--wpe_network",
-            required=False,
-            default=os.environ.get("WM_SERVICES_WPE_NETWORK", None),
-            type=int,
-            help="network id to subscribe to.",
-        )
+        self._add_group("wpe")
 
     def add_influx(self):
         """ Settings to configure influx access """
-
-        self.influx.add_argument(
-            "--influx_hostname",
-            type=str,
-            required=False,
-            default=os.environ.get("WM_SERVICES_INFLUX_HOSTNAME", None),
-            help="hostname of InfluxDB http API",
-        )
-
-        self.influx.add_argument(
-            "--influx_port",
-            type=int,
-            required=False,
-            default=os.environ.get("WM_SERVICES_INFLUX_PORT", 8886),
-            help="port of InfluxDB http API",
-        )
-
-        self.influx.add_argument(
-            "--influx_username",
-            type=str,
-            required=False,
-            default=os.environ.get("WM_SERVICES_INFLUX_USERNAME", None),
-            help="user of InfluxDB http API",
-        )
-
-        self.influx.add_argument(
-            "--influx_password",
-            type=str,
-            required=False,
-            default=os.environ.get("WM_SERVICES_INFLUX_PASSWORD", None),
-            help="password of InfluxDB http API",
-        )
-
-        self.influx.add_argument(
-            "--influx_database",
-            type=str,
-            required=False,
-            default=os.environ.get("WM_SERVICES_INFLUX_DATABASE", "wirepas"),
-            help="port of InfluxDB http API",
-        )
-
-        self.influx.add_argument(
-            "--influx_skip_ssl",
-            action="store_true",
-            default=os.environ.get("WM_SERVICES_INFLUX_SKIP_SSL", False),
-            required=False,
-            help="When true it will not try to create a TLS handshake",
-        )
-
-        self.influx.add_argument(
-            "--influx_skip_ssl_check",
-            action="store_true",
-            default=os.environ.get("WM_SERVICES_INFLUX_UNSECURE", False),
-            required=False,
-            help="when true, allows unknown certificates to be used with the TLS connection.",
-        )
-
-        self.influx.add_argument(
-            "--query_statement",
-            action="store",
-            type=str,
-            default=os.environ.get("WM_SERVICES_INFLUX_QUERY_STATEMENT", None),
-            required=False,
-            help="A generic query to run against InfluxDB",
-        )
+        self._add_group("influx")
 
     def dump(self, path):
         """ dumps the arguments into a file """
         serializer = JsonSerializer()
-        with open(path, "w") as f:
-            f.write(serializer.serialize(vars(self._arguments)))
+        with open(path, "wb") as f:
+            f.write(serializer.to_bytes(vars(self._arguments)))
@@ -17,6 +17,11 @@ import threading
 
 from google.protobuf import json_format
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def deferred_thread(fn):
     """
@@ -41,6 +46,9 @@ class JsonSerializer(json.JSONEncoder):
     Extends the JSONEncoder base class with object handlers
     for bytearrya, datetime and proto.
 
+    When orjson is installed, to_bytes uses it to encode the objects, with
+    the json module as fallback for the objects it rejects.
+
     """
 
     proto_as_json = False
@@ -74,7 +82,7 @@ class JsonSerializer(json.JSONEncoder):
             return obj.isoformat()
 
         if isinstance(obj, (bytearray, bytes)):
-            return binascii.hexlify(obj)
+            return binascii.hexlify(obj).decode()
 
         if isinstance(obj, set):
             return str(obj)
@@ -104,14 +112,40 @@ class JsonSerializer(json.JSONEncoder):
                         temp[f"{key}.{child_key}"] = child_value
             obj = temp
 
-        jobj = json.dumps(
+        return self._json_dumps(obj)
+
+    def to_bytes(self, obj) -> bytes:
+        """
+        Returns the json representation of the object as utf-8
+
+        With orjson the output is compact (indented with two spaces when
+        indent is set) and non finite floats are written as null.
+        """
+        if orjson is not None:
+            try:
+                return self._orjson_dumps(obj)
+            except TypeError:
+                pass
+
+        return self._json_dumps(obj).encode()
+
+    def _json_dumps(self, obj) -> str:
+        """ encodes the object with the json module """
+        return json.dumps(
             obj,
             cls=JsonSerializer,
             sort_keys=self.sort_keys,
             indent=self.indent,
         )
 
-        return jobj
+    def _orjson_dumps(self, obj) -> bytes:
+        """ encodes the object with orjson, raising TypeError on failure """
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self.indent is not None:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
 
 
 def flatten(input_dict, separator="/", prefix=""):